@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Generate a specialized result-log parser for a fixed table layout.
+
+Reads the metrics-table header from a sample decode result log, derives the
+byte offsets of the p90 column, and emits _parse_fast.py: straight-line
+code with the offsets inlined and no regex. plot_itl_ttft uses the emitted
+parser when present and falls back to its generic one whenever a file's
+header does not match the generated signature.
+
+Regenerate after the upstream table layout changes:
+
+    python codegen_parser.py sample_result.txt
+"""
+
+import argparse
+from pathlib import Path
+
+_SEP = "│".encode("utf-8")
+
+_TEMPLATE = '''"""Specialized result-log parser generated by codegen_parser.py.
+
+Do not edit; regenerate from a sample log instead.
+"""
+
+HEADER_SIGNATURE = {header!r}
+_P90_START = {start}
+_P90_END = {end}
+_CONC_MARK = b"DECODE TEST RESULTS - Concurrency:"
+
+
+def parse(buf):
+    """Parse a result-log buffer with hard-coded column offsets.
+
+    Raises ValueError when a table does not match the generated layout so
+    the caller can fall back to the generic parser.
+    """
+    results = {{}}
+    size = len(buf)
+    find = buf.find
+    pos = 0
+    while True:
+        h = find(_CONC_MARK, pos)
+        if h == -1:
+            break
+        num_start = h + len(_CONC_MARK)
+        nl = find(b"\\n", num_start)
+        if nl == -1:
+            nl = size
+        conc = int(buf[num_start:nl])
+        nxt = find(_CONC_MARK, nl)
+        end = size if nxt == -1 else nxt
+        if find(HEADER_SIGNATURE, nl, end) == -1:
+            raise ValueError("header signature mismatch")
+        entry = {{}}
+        for label, key in ((b"Time To First Token", "ttft_p90"),
+                           (b"Inter Token Latency", "itl_p90")):
+            lp = find(label, nl, end)
+            if lp == -1:
+                continue
+            line_start = buf.rfind(b"\\n", 0, lp) + 1
+            cell = buf[line_start + _P90_START:line_start + _P90_END]
+            cell = cell.strip().replace(b",", b"")
+            try:
+                entry[key] = float(cell)
+            except ValueError:
+                raise ValueError("row does not match generated layout")
+        results[conc] = entry
+        pos = end
+    return results
+'''
+
+
+def find_header(sample):
+    """Return the first table-header line (bytes) of a sample log."""
+    for line in sample.split(b"\n"):
+        if _SEP in line and b"avg" in line and b"p90" in line:
+            return line.rstrip()
+    return None
+
+
+def p90_span(header):
+    """Return the (start, end) byte offsets of the p90 cell in a header."""
+    positions = []
+    start = 0
+    while True:
+        idx = header.find(_SEP, start)
+        if idx == -1:
+            break
+        positions.append(idx)
+        start = idx + len(_SEP)
+    cells = header.split(_SEP)
+    for k, cell in enumerate(cells):
+        if cell.strip() == b"p90":
+            if k == 0 or k > len(positions):
+                return None
+            end = positions[k] if k < len(positions) else len(header)
+            return positions[k - 1] + len(_SEP), end
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Emit _parse_fast.py specialized to a sample log's table layout")
+    parser.add_argument("sample", help="Sample decode result log")
+    parser.add_argument("--output",
+                        default=str(Path(__file__).parent / "_parse_fast.py"),
+                        help="Path of the generated module")
+    args = parser.parse_args()
+
+    sample = Path(args.sample).read_bytes()
+    header = find_header(sample)
+    if header is None:
+        print(f"❌ No metrics-table header found in {args.sample}")
+        return
+    span = p90_span(header)
+    if span is None:
+        print("❌ Could not locate the p90 column in the header")
+        return
+
+    out = Path(args.output)
+    out.write_text(_TEMPLATE.format(header=header, start=span[0], end=span[1]))
+    print(f"✅ Wrote {out} (p90 bytes {span[0]}:{span[1]})")
+
+
+if __name__ == "__main__":
+    main()
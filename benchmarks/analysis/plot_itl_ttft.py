@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Plot ITL and TTFT P90 bars from decode test result logs.
+
+Result files are captured stdout from decode benchmark runs: blocks headed
+by "DECODE TEST RESULTS - Concurrency: N" followed by a genai-perf metrics
+table drawn with box characters. This script pulls the TTFT / ITL P90
+columns per concurrency and renders bar charts.
+"""
+
+import argparse
+import functools
+import hashlib
+import mmap
+import pickle
+import re
+import types
+from pathlib import Path
+
+try:
+    import _parse_fast
+except ImportError:
+    _parse_fast = None
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+
+plt.rcParams["path.simplify"] = True
+plt.rcParams["agg.path.chunksize"] = 10000
+
+_RE_CONC = re.compile(r"DECODE TEST RESULTS - Concurrency:\s*(\d+)")
+_RE_ISL_OSL = re.compile(r"isl(\d+)[_\-]osl(\d+)")
+_RE_OSL_ISL = re.compile(r"osl(\d+)[_\-]isl(\d+)")
+_RE_NUM = re.compile(r"[\d,]+\.?\d*")
+_RE_HAS_DIGIT = re.compile(r"\d").search
+_RE_NONNUM = re.compile(r"[^\d.]")
+_RE_TIMESTAMP = re.compile(r"(\d{8}_\d{6})")
+
+_COMMA_TBL = str.maketrans("", "", ",…")
+
+# One compiled alternation tags every interesting event in a result log;
+# each branch leads with a distinct literal so the regex engine's literal
+# prefilter skips the uninteresting spans between events. Bytes mode: the
+# scan runs over the raw mmap and only matched rows get UTF-8-decoded.
+# U+2502 (│) is \xe2\x94\x82 in UTF-8.
+_SEP_B = "│".encode("utf-8")
+_EVENT_RE_B = re.compile(
+    rb"(?:DECODE TEST RESULTS - Concurrency:\s*(?P<conc>\d+))"
+    rb"|(?:Time To First Token(?P<ttft>[^\n]*))"
+    rb"|(?:Inter Token Latency(?P<itl>[^\n]*))"
+    rb"|(?P<header>\xe2\x94\x82[^\n]*avg[^\n]*p90[^\n]*)")
+_RE_HAS_DIGIT_B = re.compile(rb"\d").search
+_RE_ALPHA_B = re.compile(rb"[A-Za-z]").search
+# Wrapped value rows may start with the unit cell (e.g. b"(ms)"); strip
+# parenthesized tokens before the any-letter test so only genuine label
+# text ends a continuation walk.
+_RE_PAREN_B = re.compile(rb"\([^)]*\)")
+
+
+def _make_p90_extractor(header_line):
+    """Build a positional P90 extractor from a table header line.
+
+    The column layout is fixed for the whole table, so the │ offsets of the
+    header locate the p90 cell once; rows are then sliced directly instead
+    of being split and regex-scanned.
+    """
+    seps = [idx for idx, ch in enumerate(header_line) if ch == "│"]
+    cells = header_line.split("│")
+    col = None
+    for k, cell in enumerate(cells):
+        if cell.strip() == "p90":
+            col = k
+            break
+    if col is None or col >= len(seps) + 1 or col == 0:
+        return None
+    start, end = seps[col - 1] + 1, (seps[col] if col < len(seps) else None)
+
+    def extract(line):
+        cell = line[start:end].strip().translate(_COMMA_TBL)
+        if not cell:
+            return None
+        try:
+            return float(cell)
+        except ValueError:
+            m = _RE_NUM.search(cell)
+            if m:
+                try:
+                    return float(m.group(0))
+                except ValueError:
+                    return None
+            return None
+
+    return extract
+
+
+_EXTRACTOR_CACHE = {}
+
+
+def _p90_extractor_for(header_line):
+    """Return the specialized extractor for a header, reusing one closure
+    per distinct header signature across the whole run."""
+    try:
+        return _EXTRACTOR_CACHE[header_line]
+    except KeyError:
+        extractor = _make_p90_extractor(header_line)
+        _EXTRACTOR_CACHE[header_line] = extractor
+        return extractor
+
+
+
+def extract_p90_from_row(line):
+    """Pull the P90 column out of a box-drawing table row.
+
+    genai-perf prints avg/min/max/p99/p90/p75 columns; depending on whether
+    the label column wrapped, P90 lands in parts[6] or parts[5].
+    """
+    parts = [part.strip() for part in line.split("│")]
+    candidates = []
+    if len(parts) > 6 and parts[6]:
+        candidates.append(parts[6])
+    if len(parts) > 5 and parts[5]:
+        candidates.append(parts[5])
+    for cand in candidates:
+        cleaned = _RE_NONNUM.sub("", cand.replace(",", ""))
+        if cleaned:
+            try:
+                return float(cleaned)
+            except ValueError:
+                pass
+        m = _RE_NUM.search(cand)
+        if m:
+            try:
+                return float(m.group(0).replace(",", ""))
+            except ValueError:
+                continue
+    return None
+
+
+def extract_isl_osl_from_filename(file_path):
+    """Recover (isl, osl) from a result filename, in either order."""
+    name = Path(file_path).name
+    if "isl" not in name and "osl" not in name:
+        return None, None
+    m = _RE_ISL_OSL.search(name)
+    if m:
+        return int(m.group(1)), int(m.group(2))
+    m = _RE_OSL_ISL.search(name)
+    if m:
+        return int(m.group(2)), int(m.group(1))
+    return None, None
+
+
+def parse_result_file(file_path):
+    """Parse a result log into {concurrency: {"ttft_p90": ..., "itl_p90": ...}}."""
+    results = {}
+    current_conc = None
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            m = _RE_CONC.search(line)
+            if m:
+                current_conc = int(m.group(1))
+                results[current_conc] = {}
+                continue
+            if current_conc is None:
+                continue
+            if "Time To First Token" in line and "│" in line:
+                value = extract_p90_from_row(line)
+                if value is not None:
+                    results[current_conc]["ttft_p90"] = value
+            elif "Inter Token Latency" in line and "│" in line:
+                value = extract_p90_from_row(line)
+                if value is not None:
+                    results[current_conc]["itl_p90"] = value
+    return results
+
+
+def plot_itl_ttft(results, title, output_file):
+    """Draw TTFT (top) and ITL (bottom) P90 bars across concurrencies."""
+    concs = sorted(results)
+    ttft = [results[c].get("ttft_p90") for c in concs]
+    itl = [results[c].get("itl_p90") for c in concs]
+
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
+
+    for i, v in enumerate(ttft):
+        if v is not None:
+            ax1.bar(i, v, color="#1f77b4", alpha=0.9)
+    ax1.set_ylabel("TTFT P90 (ms)")
+    ax1.grid(True, axis="y", alpha=0.3)
+
+    for i, v in enumerate(itl):
+        if v is not None:
+            ax2.bar(i, v, color="#ff7f0e", alpha=0.9)
+    ax2.set_ylabel("ITL P90 (ms)")
+    ax2.set_xlabel("Concurrency")
+    ax2.set_xticks(range(len(concs)))
+    ax2.set_xticklabels([str(c) for c in concs])
+    ax2.grid(True, axis="y", alpha=0.3)
+
+    fig.suptitle(title)
+    fig.tight_layout()
+    fig.savefig(output_file, dpi=150)
+    plt.close(fig)
+    print(f"📈 Saved {output_file}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plot ITL/TTFT P90 from a result log")
+    parser.add_argument("--file", required=True, help="Decode test result log")
+    parser.add_argument("--output", default="itl_ttft.png", help="Output PNG")
+    args = parser.parse_args()
+
+    results = cached_parse(args.file, Path(args.output).parent / ".parse_cache")
+    if not results:
+        print(f"❌ No results parsed from {args.file}")
+        return
+    for conc in sorted(results):
+        entry = results[conc]
+        print(f"Concurrency {conc}: TTFT p90={entry.get('ttft_p90')} "
+              f"ITL p90={entry.get('itl_p90')}")
+    plot_itl_ttft(results, Path(args.file).stem, args.output)
+
+
+# ---------------------------------------------------------------------------
+# Enhanced variants. genai-perf started wrapping long metric labels across
+# physical table lines, which the simple parser above misses. These
+# definitions supersede the ones above; the originals are kept while the log
+# format settles.
+# ---------------------------------------------------------------------------
+
+
+def parse_result_file(file_path, tail_only=False):  # noqa: F811
+    """Parse a result log, tolerating wrapped table rows.
+
+    The value columns for a label like "Time To First Token (ms)" can land
+    one to three lines below the label when the table wraps; this variant
+    looks ahead across the wrap.
+
+    With ``tail_only=True``, files over 1 MB are memory-mapped and scanned
+    backwards block by block: only the last result block per concurrency
+    matters, so a long accumulated log costs O(blocks) instead of O(bytes).
+    """
+    path = Path(file_path)
+    st = path.stat()
+    if tail_only and st.st_size >= 1 << 20:
+        return _parse_tail(path)
+    return _parse_cached(str(path), st.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_cached(path_str, mtime_ns):
+    """In-process memo of whole-file parses.
+
+    Groups in plot_multi_files share agg/disagg source files, so the same
+    path is parsed repeatedly within one run; keying on mtime keeps stale
+    entries from being served. The result is wrapped in a MappingProxyType
+    so cached dicts cannot be mutated downstream.
+    """
+    try:
+        with open(path_str, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if _parse_fast is not None:
+                try:
+                    return types.MappingProxyType(_parse_fast.parse(mm))
+                except ValueError:
+                    # Layout drifted from the generated signature; fall
+                    # through to the generic parser.
+                    pass
+            return types.MappingProxyType(_parse_core(mm))
+    except ValueError:
+        # Empty files cannot be mapped.
+        return types.MappingProxyType({})
+
+
+def _parse_tail(path):
+    """Walk result blocks from the end of the file, keeping the last block
+    seen for each concurrency."""
+    results = {}
+    with path.open("rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        end = mm.size()
+        while end > 0:
+            pos = mm.rfind(b"DECODE TEST RESULTS", 0, end)
+            if pos == -1:
+                break
+            for conc, entry in _parse_core(mm[pos:end]).items():
+                results.setdefault(conc, entry)
+            end = pos
+    return results
+
+
+def cached_parse(file_path, cache_dir):
+    """parse_result_file with an on-disk sidecar cache.
+
+    Entries are keyed by path, mtime and size, so unchanged files cost a
+    single stat plus an unpickle on re-plotting runs. Cache misses parse
+    tail-first: the plots only want the last block per concurrency, so
+    large accumulated logs stop paying O(bytes) here.
+    """
+    path = Path(file_path)
+    st = path.stat()
+    key = hashlib.blake2b(
+        f"{path}:{st.st_mtime_ns}:{st.st_size}".encode(),
+        digest_size=16).hexdigest()
+    cache_file = Path(cache_dir) / f"{key}.pkl"
+    if cache_file.exists():
+        return pickle.loads(cache_file.read_bytes())
+    # Plain dict: this value crosses pickle/process boundaries.
+    data = dict(parse_result_file(path, tail_only=True))
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_bytes(pickle.dumps(data))
+    return data
+
+
+
+def _parse_core(buf):
+    """Hot parse loop over a raw bytes buffer (mmap or bytes).
+
+    A single finditer walk over one bytes-mode alternation replaces the
+    per-line state machine; the markers of interest are ASCII apart from
+    the column separator, so the full UTF-8 decode is skipped and only
+    matched rows are decoded for float conversion.
+    """
+    results = {}
+    current_conc = None
+    has_digit = _RE_HAS_DIGIT_B
+    p90_extract = None
+    find_nl = buf.find
+    size = len(buf)
+
+    def full_row(start, end):
+        """Expand a mid-line match to the physical row, stitching up to
+        three wrapped continuation lines when the label row has no digits."""
+        line_start = buf.rfind(b"\n", 0, start) + 1
+        line_end = find_nl(b"\n", end)
+        if line_end == -1:
+            line_end = size
+        row = buf[line_start:line_end]
+        if has_digit(row):
+            return row
+        # Walk the block's continuation rows once: a numeric row (digits,
+        # no letters outside a parenthesized unit cell) is the wrapped
+        # value row; any other lettered row is the next metric's label and
+        # ends the walk, as does the table border.
+        pos = line_end
+        for _ in range(3):
+            nxt = find_nl(b"\n", pos + 1)
+            if nxt == -1:
+                nxt = size
+            next_line = buf[pos + 1:nxt]
+            if (b"\xe2\x94\x94" in next_line
+                    or _RE_ALPHA_B(_RE_PAREN_B.sub(b"", next_line))):
+                break
+            if _SEP_B in next_line and has_digit(next_line):
+                return next_line
+            pos = nxt
+            if pos >= size:
+                break
+        return row
+
+    for m in _EVENT_RE_B.finditer(buf):
+        group = m.lastgroup
+        if group == "conc":
+            current_conc = int(m.group("conc"))
+            results[current_conc] = {}
+        elif group == "header":
+            line_start = buf.rfind(b"\n", 0, m.start()) + 1
+            line_end = find_nl(b"\n", m.end())
+            if line_end == -1:
+                line_end = size
+            header = buf[line_start:line_end].decode("utf-8", "ignore")
+            extractor = _p90_extractor_for(header)
+            if extractor is not None:
+                p90_extract = extractor
+        elif current_conc is not None and group in ("ttft", "itl"):
+            raw = full_row(m.start(), m.end())
+            if _SEP_B not in raw:
+                continue
+            row = raw.decode("utf-8", "ignore")
+            value = p90_extract(row) if p90_extract else None
+            if value is None:
+                value = extract_p90_from_row(row)
+            if value is not None:
+                key = "ttft_p90" if group == "ttft" else "itl_p90"
+                results[current_conc][key] = value
+
+    return results
+
+
+def main():  # noqa: F811
+    parser = argparse.ArgumentParser(
+        description="Plot ITL/TTFT P90 bars from decode test result logs")
+    parser.add_argument("files", nargs="+", help="Decode test result logs")
+    parser.add_argument("--output-dir", default="plots", help="Directory for PNGs")
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    cache_dir = output_dir / ".parse_cache"
+    for file in args.files:
+        results = cached_parse(file, cache_dir)
+        if not results:
+            print(f"⚠️ No results parsed from {file}, skipping")
+            continue
+
+        isl, osl = extract_isl_osl_from_filename(file)
+        title = Path(file).stem
+        if isl is not None:
+            title = f"{title} (ISL={isl}, OSL={osl})"
+
+        stem = Path(file).stem
+        m = _RE_TIMESTAMP.search(stem)
+        suffix = m.group(1) if m else stem
+        out = output_dir / f"itl_ttft_{suffix}.png"
+        plot_itl_ttft(results, title, out)
+
+
+if __name__ == "__main__":
+    main()
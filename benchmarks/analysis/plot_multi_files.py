@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Batch-plot agg-vs-disagg ITL/TTFT comparisons from a results directory.
+
+Expects result logs named like agg_*isl3000_osl150*.txt and
+disagg_*isl3000_osl150*.txt, groups them by (ISL, OSL), and writes one dual
+bar chart per group comparing the two deployments.
+"""
+
+import argparse
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+
+plt.rcParams["path.simplify"] = True
+plt.rcParams["agg.path.chunksize"] = 10000
+import numpy as np
+
+from plot_itl_ttft import cached_parse
+
+# Deployment type and sequence lengths in one match per filename.
+_RE_NAME = re.compile(r"^(agg|disagg)_.*isl(\d+)[_\-]osl(\d+)")
+
+
+def find_and_group_files(results_dir):
+    """Group result .txt files by (isl, osl) into agg/disagg buckets."""
+    groups = {}
+    entries = []
+    with os.scandir(results_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".txt"):
+                entries.append((entry.name, entry.path))
+    for name, path in sorted(entries):
+        m = _RE_NAME.match(name)
+        if m is None:
+            continue
+        deploy, isl, osl = m.group(1), int(m.group(2)), int(m.group(3))
+        groups.setdefault((isl, osl), {}).setdefault(deploy, []).append(
+            Path(path))
+    return groups
+
+
+def plot_dual_bars(fig, ax_top, ax_bot, agg_data, disagg_data, isl, osl,
+                   output_file, dpi=100):
+    """Draw paired ITL (top) and TTFT (bottom) bars for one group.
+
+    The figure is created once by the caller and reused across groups;
+    axes are cleared here so each group pays only for its own artists.
+    """
+    ax_top.clear()
+    ax_bot.clear()
+    for text in list(fig.texts):
+        text.remove()
+    all_conc = sorted(set(agg_data) | set(disagg_data))
+    n = len(all_conc)
+    nan = np.nan
+    agg_itl = np.full(n, nan)
+    dis_itl = np.full(n, nan)
+    agg_ttft = np.full(n, nan)
+    dis_ttft = np.full(n, nan)
+    for i, c in enumerate(all_conc):
+        a = agg_data.get(c)
+        if a:
+            agg_itl[i] = a.get("itl_p90", nan)
+            agg_ttft[i] = a.get("ttft_p90", nan)
+        d = disagg_data.get(c)
+        if d:
+            dis_itl[i] = d.get("itl_p90", nan)
+            dis_ttft[i] = d.get("ttft_p90", nan)
+
+    # Non-finite heights are skipped by matplotlib, so one bar() call per
+    # series replaces the per-point loop with its per-call validation.
+    width = 0.35
+    x = np.arange(len(all_conc))
+    bar_sets = []
+    bar_sets.append(ax_top.bar(x - width / 2, agg_itl, width=width,
+                               color="#1f77b4", alpha=0.9,
+                               label="agg ITL p90 (ms)"))
+    bar_sets.append(ax_top.bar(x + width / 2, dis_itl, width=width,
+                               color="#d62728", alpha=0.9,
+                               label="disagg ITL p90 (ms)"))
+    itl_all = np.concatenate([agg_itl, dis_itl])
+    itl_max = np.nanmax(itl_all) if np.isfinite(itl_all).any() else 0.0
+    if itl_max:
+        ax_top.set_ylim(0, itl_max * 1.2)
+    ax_top.set_ylabel("ITL P90 (ms)")
+    ax_top.grid(True, axis="y", alpha=0.3)
+    ax_top.legend()
+
+    bar_sets.append(ax_bot.bar(x - width / 2, agg_ttft, width=width,
+                               color="#1f77b4", alpha=0.9,
+                               label="agg TTFT p90 (ms)"))
+    bar_sets.append(ax_bot.bar(x + width / 2, dis_ttft, width=width,
+                               color="#d62728", alpha=0.9,
+                               label="disagg TTFT p90 (ms)"))
+    ttft_all = np.concatenate([agg_ttft, dis_ttft])
+    ttft_max = np.nanmax(ttft_all) if np.isfinite(ttft_all).any() else 0.0
+    if ttft_max:
+        ax_bot.set_ylim(0, ttft_max * 1.2)
+    ax_bot.set_ylabel("TTFT P90 (ms)")
+    ax_bot.set_xlabel("Concurrency")
+    ax_bot.set_xticks(range(len(all_conc)))
+    ax_bot.set_xticklabels([str(c) for c in all_conc])
+    ax_bot.grid(True, axis="y", alpha=0.3)
+    ax_bot.legend()
+
+    for bars in bar_sets:
+        for bar in bars:
+            bar.set_rasterized(True)
+
+    fig.suptitle(f"agg vs disagg — ISL={isl}, OSL={osl}")
+    fig.savefig(output_file, dpi=dpi, format="png",
+                pil_kwargs={"compress_level": 1})
+    print(f"📈 Saved {output_file}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Plot agg vs disagg ITL/TTFT bars for every (ISL, OSL) group")
+    parser.add_argument("--results-dir", default="results", help="Directory of result logs")
+    parser.add_argument("--output-dir", default="plots", help="Directory for PNGs")
+    parser.add_argument("--dpi", type=int, default=100,
+                        help="PNG resolution; use 150 for final figures")
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    groups = find_and_group_files(args.results_dir)
+    if not groups:
+        print(f"❌ No result files found in {args.results_dir}")
+        return
+
+    # Parsing is CPU-bound and embarrassingly parallel; fan every file in
+    # every group out across cores, then assemble per-group dicts.
+    all_files = [file for buckets in groups.values()
+                 for files in buckets.values() for file in files]
+    parse = partial(cached_parse, cache_dir=output_dir / ".parse_cache")
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        parsed = dict(zip(all_files, ex.map(parse, all_files)))
+
+    fig, (ax_top, ax_bot) = plt.subplots(
+        2, 1, figsize=(14, 8), sharex=True, layout="constrained",
+        gridspec_kw={"height_ratios": [2, 2]})
+
+    for (isl, osl), buckets in sorted(groups.items()):
+        agg_data = {}
+        for file in buckets.get("agg", []):
+            agg_data.update(parsed.get(file) or {})
+        disagg_data = {}
+        for file in buckets.get("disagg", []):
+            disagg_data.update(parsed.get(file) or {})
+        if not agg_data and not disagg_data:
+            continue
+        out = output_dir / f"itl_ttft_compare_isl{isl}_osl{osl}.png"
+        plot_dual_bars(fig, ax_top, ax_bot, agg_data, disagg_data, isl, osl,
+                       out, dpi=args.dpi)
+
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    main()
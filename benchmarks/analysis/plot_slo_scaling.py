@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Plot SLO-constrained scaling curves from benchmark sweep CSVs.
+
+For each SLO scale factor in a sweep (e.g. "TTFT may be 1.5x the target"),
+finds the highest concurrency and throughput whose latency metrics still
+meet the scaled targets, and plots agg vs disagg scaling curves.
+"""
+
+import argparse
+import functools
+import os
+from dataclasses import dataclass
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import matplotlib
+
+# Batch PNG output only: selecting Agg before pyplot loads avoids any
+# GUI-backend initialization.
+matplotlib.use("Agg")
+matplotlib.rcParams["path.simplify_threshold"] = 1.0
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+# Short SLO metric names to sweep-CSV columns.
+METRIC_COLUMN_MAP = {
+    "ttft": "time_to_first_token_avg",
+    "itl": "inter_token_latency_avg",
+    "request_latency": "request_latency_avg",
+}
+
+REQUEST_THROUGHPUT_COL = "request_throughput_avg"
+
+# Only these columns are ever read; skipping the rest keeps the parse and
+# the sidecar cache proportional to what the curves actually use.
+_FLOAT_COLS = frozenset(METRIC_COLUMN_MAP.values()) | {REQUEST_THROUGHPUT_COL}
+_NEEDED_COLS = _FLOAT_COLS | {"concurrency"}
+_DTYPES = {"concurrency": "int64", **{c: "float64" for c in _FLOAT_COLS}}
+
+
+def load_csv_data(csv_file):
+    """Load a sweep CSV into a dict of NumPy column arrays.
+
+    Columnar float64 arrays (int64 for concurrency) let the SLO checks
+    run as vectorized comparisons instead of per-row dict lookups.
+    Results are memoized in-process per (path, mtime) for notebook-style
+    repeated calls and pickled to a sidecar next to the CSV for repeated
+    runs; a changed CSV invalidates both automatically.
+    """
+    return _load_csv_cached(str(csv_file), os.stat(csv_file).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_csv_cached(csv_file, mtime_ns):
+    path = Path(csv_file)
+    cache = path.with_suffix(".cache.pkl")
+    try:
+        if cache.stat().st_mtime >= path.stat().st_mtime:
+            with open(cache, "rb") as f:
+                return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    df = pd.read_csv(csv_file, usecols=lambda name: name in _NEEDED_COLS,
+                     dtype=_DTYPES)
+    cols = {name: df[name].to_numpy() for name in df.columns}
+    for name in _FLOAT_COLS & cols.keys():
+        cols[name] = np.nan_to_num(cols[name], nan=0.0)
+    try:
+        with open(cache, "wb") as f:
+            pickle.dump(cols, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return cols
+
+
+def _resolve_columns(cols, metrics, metric_column_map):
+    """Bind metric targets to their present column arrays, once.
+
+    Resolving the name mapping up front keeps repeated `.get` lookups and
+    presence checks out of every mask or threshold evaluation.
+    """
+    resolved = []
+    for metric, target in metrics.items():
+        col = metric_column_map.get(metric, metric)
+        if col in cols:
+            resolved.append((cols[col], target))
+    return resolved
+
+
+def _slo_mask(n, scalable_cols, fixed_cols, scale_factor):
+    """Boolean mask of rows meeting every SLO at one scale factor.
+
+    ``scalable_cols`` / ``fixed_cols`` are pre-resolved (array, target)
+    pairs; scalable targets are multiplied by the scale factor, fixed
+    targets must hold as-is.
+    """
+    mask = np.ones(n, dtype=bool)
+    for arr, target in scalable_cols:
+        mask &= arr < target * scale_factor
+        # Once nothing passes, later constraints can't revive rows.
+        if not mask.any():
+            return mask
+    for arr, target in fixed_cols:
+        mask &= arr < target
+        if not mask.any():
+            return mask
+    return mask
+
+
+def find_max_concurrency_for_scale_factor(cols, scalable_metrics,
+                                          fixed_metrics, scale_factor,
+                                          metric_column_map):
+    """Highest concurrency meeting every SLO at one scale factor."""
+    mask = _slo_mask(cols["concurrency"].size,
+                     _resolve_columns(cols, scalable_metrics,
+                                      metric_column_map),
+                     _resolve_columns(cols, fixed_metrics, metric_column_map),
+                     scale_factor)
+    return int(cols["concurrency"][mask].max(initial=0))
+
+
+def find_max_throughput_for_scale_factor(cols, scalable_metrics,
+                                         fixed_metrics, scale_factor,
+                                         metric_column_map):
+    """Highest request throughput meeting every SLO at one scale factor."""
+    mask = _slo_mask(cols["concurrency"].size,
+                     _resolve_columns(cols, scalable_metrics,
+                                      metric_column_map),
+                     _resolve_columns(cols, fixed_metrics, metric_column_map),
+                     scale_factor)
+    return float(cols[REQUEST_THROUGHPUT_COL][mask].max(initial=0.0))
+
+
+def precompute_feasibility(cols, scalable_metrics, fixed_metrics,
+                           metric_column_map):
+    """Reduce the sweep to sorted feasibility thresholds and running maxima.
+
+    The scalable constraint ``actual < target * scale`` is monotone in the
+    scale factor, so each row has one minimum feasible scale,
+    ``max(actual / target)``; rows failing a fixed constraint are dropped
+    outright. With rows sorted by that threshold, the rows feasible at any
+    scale form a prefix, so running maxima of concurrency and throughput
+    answer every scale query with a single searchsorted.
+    """
+    n = cols["concurrency"].size
+    min_scale = np.zeros(n)
+    keep = np.ones(n, dtype=bool)
+    for arr, target in _resolve_columns(cols, scalable_metrics,
+                                        metric_column_map):
+        if target > 0:
+            np.maximum(min_scale, arr / target, out=min_scale)
+    for arr, target in _resolve_columns(cols, fixed_metrics,
+                                        metric_column_map):
+        keep &= arr < target
+    order = np.argsort(min_scale[keep], kind="stable")
+    return {
+        "min_scale": min_scale[keep][order],
+        "max_conc": np.maximum.accumulate(
+            cols["concurrency"][keep][order], axis=0)
+        if order.size else cols["concurrency"][:0],
+        "max_thr": np.maximum.accumulate(
+            cols[REQUEST_THROUGHPUT_COL][keep][order], axis=0)
+        if order.size else cols[REQUEST_THROUGHPUT_COL][:0],
+    }
+
+
+def _scale_grid(scale_min, scale_max, scale_step):
+    """Ascending scale factors covering [scale_min, scale_max] inclusive."""
+    scales = np.arange(scale_max, scale_min - scale_step / 2, -scale_step)
+    return np.round(scales, 12)[::-1]
+
+
+def _feasible_curve(feas, key, scales):
+    """Max of ``key`` at every scale factor in one vectorized lookup."""
+    thresholds = feas["min_scale"]
+    if not thresholds.size:
+        return np.zeros(scales.size)
+    # side="left" keeps the original strict actual < target * scale.
+    idx = np.searchsorted(thresholds, scales, side="left")
+    return np.where(idx > 0, feas[key][idx - 1], 0)
+
+
+def calculate_scaling_curve_throughput(cols, scalable_metrics, fixed_metrics,
+                                       metric_column_map, scale_min=1.0,
+                                       scale_max=6.0, scale_step=0.1):
+    """Max feasible throughput at each scale factor, ascending."""
+    feas = precompute_feasibility(cols, scalable_metrics, fixed_metrics,
+                                  metric_column_map)
+    scales = _scale_grid(scale_min, scale_max, scale_step)
+    return scales, _feasible_curve(feas, "max_thr", scales)
+
+
+def calculate_scaling_curve_concurrency(cols, scalable_metrics, fixed_metrics,
+                                        metric_column_map, scale_min=1.0,
+                                        scale_max=6.0, scale_step=0.1):
+    """Max feasible concurrency at each scale factor, ascending."""
+    feas = precompute_feasibility(cols, scalable_metrics, fixed_metrics,
+                                  metric_column_map)
+    scales = _scale_grid(scale_min, scale_max, scale_step)
+    return scales, _feasible_curve(feas, "max_conc", scales)
+
+
+def calculate_curves_batch(datasets, scalable_metrics, fixed_metrics,
+                           metric_column_map, scale_min=1.0, scale_max=6.0,
+                           scale_step=0.1):
+    """Throughput and concurrency curves for several datasets at once.
+
+    Feasibility is precomputed once per dataset and one scale grid is
+    shared by every curve, so compare mode does half the threshold
+    sorting that separate per-curve calls would.
+    """
+    scales = _scale_grid(scale_min, scale_max, scale_step)
+
+    def _one(item):
+        name, cols = item
+        feas = precompute_feasibility(cols, scalable_metrics, fixed_metrics,
+                                      metric_column_map)
+        return name, (_feasible_curve(feas, "max_thr", scales),
+                      _feasible_curve(feas, "max_conc", scales))
+
+    # NumPy releases the GIL inside the sort/ufunc kernels, so the
+    # independent datasets overlap well on a thread pool.
+    with ThreadPoolExecutor(
+            max_workers=min(len(datasets), os.cpu_count() or 2)) as ex:
+        curves = dict(ex.map(_one, datasets.items()))
+    return scales, curves
+
+
+def _dedup_steps(xs, ys):
+    """Collapse runs of identical y-values to their leading point.
+
+    Max-feasible curves are piecewise constant, so only the points where
+    the value changes (plus the final point) matter to a post-step plot;
+    finer scale steps then add no extra segments to rasterize.
+    """
+    xs = np.asarray(xs)
+    ys = np.asarray(ys)
+    if ys.size < 3:
+        return xs, ys
+    keep = np.empty(ys.size, dtype=bool)
+    keep[0] = True
+    keep[1:] = ys[1:] != ys[:-1]
+    keep[-1] = True
+    return xs[keep], ys[keep]
+
+
+@dataclass
+class Curve:
+    """One line in an overlay figure."""
+    x: object
+    y: object
+    label: str
+    color: str
+    marker: str
+
+
+def _make_curve_figure(curves, ylabel, title, output_file):
+    """Render one overlay figure from a list of curve specs.
+
+    Both compare plotters delegate here so the figure scaffolding exists
+    once. dpi 150 halves rasterization time and quarters file size
+    versus 300 with no visible loss at this figure size.
+    """
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for curve in curves:
+        # step(where="post") is the faithful rendering: each feasible
+        # maximum holds until the next threshold is crossed.
+        xs, ys = _dedup_steps(curve.x, curve.y)
+        ax.step(xs, ys, where="post", marker=curve.marker, markersize=5,
+                linewidth=2, color=curve.color, label=curve.label)
+    ax.set_xlabel("SLO scale factor")
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(output_file, dpi=150)
+    plt.close(fig)
+    print(f"📈 Saved {output_file}")
+
+
+def plot_scaling_throughput_compare(scales_agg, thr_agg, scales_disagg,
+                                    thr_disagg, output_file):
+    """Overlay agg vs disagg max-throughput scaling curves."""
+    _make_curve_figure(
+        [Curve(scales_agg, thr_agg, "agg", "#1f77b4", "o"),
+         Curve(scales_disagg, thr_disagg, "disagg", "#d62728", "s")],
+        "Max request throughput (req/s)",
+        "Max throughput vs SLO scale factor", output_file)
+
+
+def plot_scaling_concurrency_compare(scales_agg, conc_agg, scales_disagg,
+                                     conc_disagg, output_file):
+    """Overlay agg vs disagg max-concurrency scaling curves."""
+    _make_curve_figure(
+        [Curve(scales_agg, conc_agg, "agg", "#1f77b4", "o"),
+         Curve(scales_disagg, conc_disagg, "disagg", "#d62728", "s")],
+        "Max concurrency",
+        "Max concurrency vs SLO scale factor", output_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Plot SLO-constrained scaling curves from sweep CSVs")
+    parser.add_argument("--csv-agg", required=True,
+                        help="Aggregated-deployment sweep CSV")
+    parser.add_argument("--csv-disagg", required=True,
+                        help="Disaggregated-deployment sweep CSV")
+    parser.add_argument("--output-dir", default="plots",
+                        help="Directory for PNGs")
+    parser.add_argument("--ttft-slo", type=float, default=200.0,
+                        help="TTFT target in ms (scaled by the sweep)")
+    parser.add_argument("--itl-slo", type=float, default=20.0,
+                        help="ITL target in ms (scaled by the sweep)")
+    parser.add_argument("--request-latency-slo", type=float, default=0.0,
+                        help="Fixed request-latency cap in ms (0 disables)")
+    parser.add_argument("--scale-min", type=float, default=1.0)
+    parser.add_argument("--scale-max", type=float, default=6.0)
+    parser.add_argument("--scale-step", type=float, default=0.1)
+    args = parser.parse_args()
+
+    scalable_metrics = {"ttft": args.ttft_slo, "itl": args.itl_slo}
+    fixed_metrics = {}
+    if args.request_latency_slo > 0:
+        fixed_metrics["request_latency"] = args.request_latency_slo
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    data_agg = load_csv_data(args.csv_agg)
+    data_disagg = load_csv_data(args.csv_disagg)
+    if data_agg["concurrency"].size == 0 or data_disagg["concurrency"].size == 0:
+        print("❌ Empty sweep inputs")
+        return
+
+    scales, curves = calculate_curves_batch(
+        {"agg": data_agg, "disagg": data_disagg}, scalable_metrics,
+        fixed_metrics, METRIC_COLUMN_MAP, args.scale_min, args.scale_max,
+        args.scale_step)
+    thr_agg, conc_agg = curves["agg"]
+    thr_disagg, conc_disagg = curves["disagg"]
+
+    print(f"At scale 1.0: agg {thr_agg[0]:.2f} req/s, "
+          f"disagg {thr_disagg[0]:.2f} req/s")
+    plot_scaling_throughput_compare(
+        scales, thr_agg, scales, thr_disagg,
+        output_dir / "slo_scaling_throughput.png")
+    plot_scaling_concurrency_compare(
+        scales, conc_agg, scales, conc_disagg,
+        output_dir / "slo_scaling_concurrency.png")
+
+
+if __name__ == "__main__":
+    main()
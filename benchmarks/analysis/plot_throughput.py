@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Plot concurrency-vs-throughput curves from benchmark sweep CSVs.
+
+Single-file mode plots request and token throughput for one sweep; compare
+mode overlays aggregated vs disaggregated deployments, including an ITL
+comparison when the CSV carries latency columns.
+"""
+
+import argparse
+import functools
+from datetime import datetime
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+
+def load_csv_data(csv_file):
+    """Load a sweep CSV into a dict of NumPy column arrays.
+
+    Arrow's native CSV reader parses straight into columnar arrays with no
+    per-row Python objects; the pandas path is kept as a fallback when
+    pyarrow is not installed.
+    """
+    if pacsv is not None:
+        table = pacsv.read_csv(
+            csv_file,
+            convert_options=pacsv.ConvertOptions(
+                column_types={"concurrency": pa.int64()}))
+        arrs = {name: table.column(name).to_numpy(zero_copy_only=False)
+                for name in table.column_names}
+    else:
+        df = pd.read_csv(csv_file)
+        arrs = {name: df[name].to_numpy() for name in df.columns}
+    for name, arr in arrs.items():
+        if arr.dtype.kind == "f":
+            arrs[name] = np.nan_to_num(arr, nan=0.0)
+    arrs["concurrency"] = np.nan_to_num(arrs["concurrency"]).astype(int)
+    return arrs
+
+
+def _sorted_arrays(data, value_cols):
+    """Sort once by concurrency and gather all value columns as NumPy arrays.
+
+    One argsort plus fancy indexing replaces the per-function
+    sorted()-plus-list-comprehension walks over row dicts.
+    """
+    conc = data["concurrency"]
+    order = np.argsort(conc, kind="stable")
+    arrays = [conc[order]]
+    for col in value_cols:
+        if col in data:
+            arrays.append(data[col][order])
+        else:
+            arrays.append(np.zeros(conc.size))
+    return arrays
+
+
+_FIG_CACHE = {}
+
+
+def _get_or_create_fig(figsize, n_axes):
+    """Reuse one Figure per (figsize, n_axes) across invocations.
+
+    Axes construction and tick setup dominate matplotlib's render path for
+    small plots; clearing and re-plotting into a cached Figure avoids paying
+    that per CSV when this script runs inside a sweep loop.
+    """
+    key = (figsize, n_axes)
+    cached = _FIG_CACHE.get(key)
+    if cached is None:
+        fig, axes = plt.subplots(n_axes, 1, figsize=figsize)
+        fig.set_layout_engine('constrained')
+        if n_axes == 1:
+            axes = (axes,)
+        cached = _FIG_CACHE[key] = (fig, tuple(axes))
+    else:
+        for ax in cached[1]:
+            ax.cla()
+    return cached
+
+
+def _plot_panels(panels, output_file):
+    """Render a stack of panels sharing the concurrency x-axis.
+
+    ``panels`` is a list of ``(ylabel, title, series)`` entries where
+    ``series`` is a list of ``(x, y, label, color, marker)`` tuples. All
+    three public plotters delegate here so figure reuse and draw-path
+    tweaks only need to be applied once.
+    """
+    fig, axes = _get_or_create_fig((12, 6 * len(panels)), len(panels))
+    for ax, (ylabel, title, series) in zip(axes, panels):
+        for x, y, label, color, marker in series:
+            # Per-marker path patches dominate draw time on dense sweeps;
+            # past ~50 points the line alone reads just as well.
+            ax.plot(x, y, marker=marker if len(x) <= 50 else None,
+                    markersize=6, alpha=0.8, color=color, label=label,
+                    rasterized=True)
+        ax.set_xlabel("Concurrency")
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+    fig.savefig(output_file, dpi=300)
+    print(f"📈 Saved {output_file}")
+
+
+def plot_concurrency_throughput(conc, req, tok, output_file, title_suffix=""):
+    """Plot request and token throughput against concurrency for one sweep."""
+    _plot_panels([
+        ("Request throughput (req/s)",
+         f"Request throughput vs concurrency{title_suffix}",
+         [(conc, req, 'Request throughput', '#1f77b4', 'o')]),
+        ("Token throughput (tok/s)",
+         f"Token throughput vs concurrency{title_suffix}",
+         [(conc, tok, 'Token throughput', '#ff7f0e', 's')]),
+    ], output_file)
+
+
+def plot_concurrency_throughput_compare(conc_agg, req_agg, tok_agg,
+                                        conc_disagg, req_disagg, tok_disagg,
+                                        output_file, title_suffix=""):
+    """Overlay agg vs disagg request/token throughput curves."""
+    _plot_panels([
+        ("Request throughput (req/s)",
+         f"Request throughput vs concurrency{title_suffix}",
+         [(conc_agg, req_agg, 'agg', '#1f77b4', 'o'),
+          (conc_disagg, req_disagg, 'disagg', '#d62728', 's')]),
+        ("Token throughput (tok/s)",
+         f"Token throughput vs concurrency{title_suffix}",
+         [(conc_agg, tok_agg, 'agg', '#1f77b4', 'o'),
+          (conc_disagg, tok_disagg, 'disagg', '#d62728', 's')]),
+    ], output_file)
+
+
+def plot_itl_concurrency_compare(conc_agg, itl_agg, conc_disagg, itl_disagg,
+                                 output_file, title_suffix=""):
+    """Overlay agg vs disagg ITL P90 curves."""
+    _plot_panels([
+        ("ITL P90 (ms)",
+         f"ITL P90 vs concurrency{title_suffix}",
+         [(conc_agg, itl_agg, 'agg', '#1f77b4', 'o'),
+          (conc_disagg, itl_disagg, 'disagg', '#d62728', 's')]),
+    ], output_file)
+
+
+def _pick_column(columns, candidates):
+    for candidate in candidates:
+        if candidate in columns:
+            return candidate
+    return None
+
+
+REQUEST_COL_CANDIDATES = ("request_throughput_avg", "request_throughput")
+TOKEN_COL_CANDIDATES = ("output_token_throughput_avg", "output_token_throughput")
+ITL_COL_CANDIDATES = ("inter_token_latency_p90", "itl_p90")
+
+
+@functools.lru_cache(maxsize=64)
+def _load_meta(csv_path):
+    """Return (columns, isl, osl, title_suffix) for a CSV, cached per path.
+
+    Sweep mode revisits the same CSVs; the header scan and title f-string
+    only need to happen once per file.
+    """
+    head = pd.read_csv(csv_path, nrows=1)
+    columns = frozenset(head.columns)
+    isl = float(head["input_sequence_length"].iloc[0]) if "input_sequence_length" in columns else 0
+    osl = float(head["output_sequence_length"].iloc[0]) if "output_sequence_length" in columns else 0
+    title_suffix = f" (ISL={isl:.0f}, OSL={osl:.0f})" if isl else ""
+    return columns, isl, osl, title_suffix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plot throughput curves from sweep CSVs")
+    parser.add_argument("--csv", help="Sweep CSV (single-deployment mode)")
+    parser.add_argument("--csv-agg", help="Aggregated-deployment CSV (compare mode)")
+    parser.add_argument("--csv-disagg", help="Disaggregated-deployment CSV (compare mode)")
+    parser.add_argument("--output-dir", default="plots", help="Directory for PNGs")
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.csv:
+        data = load_csv_data(args.csv)
+        n_rows = data["concurrency"].size
+        if n_rows == 0:
+            print(f"❌ No rows in {args.csv}")
+            return
+
+        columns, _isl, _osl, title_suffix = _load_meta(args.csv)
+        request_col = _pick_column(columns, REQUEST_COL_CANDIDATES)
+        token_col = _pick_column(columns, TOKEN_COL_CANDIDATES)
+        if request_col is None or token_col is None:
+            print(f"❌ Missing throughput columns in {args.csv}")
+            return
+
+        conc, req, tok = _sorted_arrays(data, (request_col, token_col))
+
+        print(f"Loaded {n_rows} rows from {args.csv}")
+        print(f"Concurrency range: {conc.min()} - {conc.max()}")
+        print(f"Request throughput: min={req.min():.2f} "
+              f"max={req.max():.2f} mean={req.mean():.2f}")
+        best_idx = req.argmax()
+        print(f"Best: {req[best_idx]:.2f} req/s "
+              f"at concurrency {conc[best_idx]}")
+        print(f"Token throughput: min={tok.min():.2f} "
+              f"max={tok.max():.2f} mean={tok.mean():.2f}")
+
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        out = output_dir / f"throughput_{stamp}.png"
+        plot_concurrency_throughput(conc, req, tok, out, title_suffix)
+
+    elif args.csv_agg and args.csv_disagg:
+        data_agg = load_csv_data(args.csv_agg)
+        data_disagg = load_csv_data(args.csv_disagg)
+        if data_agg["concurrency"].size == 0 or data_disagg["concurrency"].size == 0:
+            print("❌ Empty compare inputs")
+            return
+
+        columns, _isl, _osl, title_suffix = _load_meta(args.csv_agg)
+        request_col = _pick_column(columns, REQUEST_COL_CANDIDATES)
+        token_col = _pick_column(columns, TOKEN_COL_CANDIDATES)
+        itl_col = _pick_column(columns, ITL_COL_CANDIDATES)
+        if request_col is None or token_col is None:
+            print("❌ Missing throughput columns in compare inputs")
+            return
+
+        conc_agg, req_agg, tok_agg, itl_agg = _sorted_arrays(
+            data_agg, (request_col, token_col, itl_col))
+        conc_disagg, req_disagg, tok_disagg, itl_disagg = _sorted_arrays(
+            data_disagg, (request_col, token_col, itl_col))
+
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        out = output_dir / f"throughput_compare_{stamp}.png"
+        plot_concurrency_throughput_compare(conc_agg, req_agg, tok_agg,
+                                            conc_disagg, req_disagg, tok_disagg,
+                                            out, title_suffix)
+        if itl_col is not None:
+            itl_out = output_dir / f"itl_compare_{stamp}.png"
+            plot_itl_concurrency_compare(conc_agg, itl_agg, conc_disagg,
+                                         itl_disagg, itl_out, title_suffix)
+    else:
+        parser.error("Provide --csv, or both --csv-agg and --csv-disagg")
+
+
+if __name__ == "__main__":
+    main()
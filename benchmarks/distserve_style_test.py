@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+DistServe-style goodput test for a single deployment.
+
+Inspired by the DistServe evaluation methodology: for every SLO tier the test
+finds the highest concurrency whose TTFT/ITL P90 latencies still satisfy the
+tier, and reports goodput (requests/s completed within SLO) at that point.
+genai-perf drives the actual load; this script orchestrates the sweep and the
+per-tier analysis.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import requests
+
+try:
+    import orjson  # several times faster than stdlib json on large exports
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # streaming parser: extract scalars without materializing `data` arrays
+except ImportError:
+    ijson = None
+
+# The only fields the sweep itself reads from a profile export.
+_SCALAR_FIELDS = (
+    ("request_throughput", "avg"),
+    ("output_token_throughput", "avg"),
+    ("output_token_throughput_per_user", "avg"),
+    ("time_to_first_token", "p90"),
+    ("inter_token_latency", "p90"),
+)
+
+
+def _extract_scalars(path: Path) -> dict:
+    """Stream-parse just the needed scalar metrics from a profile export.
+
+    Large exports also carry per-request `data` arrays that the sweep never
+    touches; ijson walks the file without building Python objects for them,
+    keeping peak memory per probe O(1).
+    """
+    targets = {f"{metric}.{stat}" for metric, stat in _SCALAR_FIELDS}
+    out = {}
+    with open(path, "rb") as f:
+        for prefix, event, value in ijson.parse(f):
+            if prefix in targets and event in ("number", "integer", "double"):
+                metric, stat = prefix.rsplit(".", 1)
+                out.setdefault(metric, {})[stat] = float(value)
+                targets.discard(prefix)
+                if not targets:
+                    break
+    return out
+
+
+class DistServeStyleTest:
+    """Sweep concurrency per SLO tier against one deployment."""
+
+    def __init__(self, model_name: str, service_url: str,
+                 results_dir: str = "distserve_results",
+                 analyze_distributions: bool = False,
+                 reuse_exports: bool = False,
+                 export_ttl_hours: float = 24.0):
+        self.model_name = model_name
+        self.service_url = service_url
+        # Opt-in reuse of on-disk profile exports (e.g. from an aborted
+        # earlier run); exports older than the TTL are re-run.
+        self.reuse_exports = reuse_exports
+        self.export_ttl_s = export_ttl_hours * 3600
+        # Full-export parsing is only needed when the raw TTFT/TPOT sample
+        # distributions are analyzed; the sweep itself needs five scalars.
+        self.analyze_distributions = analyze_distributions
+        self.results_dir = Path(results_dir)
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+
+        # P90 latency targets in milliseconds.
+        self.slo_configs = {
+            "ultra_strict": {"ttft": 200, "itl": 10},
+            "strict": {"ttft": 400, "itl": 15},
+            "normal": {"ttft": 1000, "itl": 25},
+            "loose": {"ttft": 2000, "itl": 50},
+            "very_loose": {"ttft": 5000, "itl": 100},
+        }
+
+        # Lazily-created persistent HTTP session; see the `session` property.
+        self._session = None
+
+        # Raw genai-perf results keyed by (isl, osl, concurrency). The latency
+        # distribution at a given concurrency is independent of the SLO tier,
+        # so all five tiers share raw measurements. Per-key locks keep tiers
+        # running in parallel from launching duplicate probes.
+        self._bench_cache = {}
+        self._cache_lock = threading.Lock()
+        self._inflight = {}
+
+    @property
+    def session(self) -> requests.Session:
+        """Persistent keep-alive session reused for all auxiliary REST calls."""
+        if self._session is None:
+            session = requests.Session()
+            session.headers["Connection"] = "keep-alive"
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def check_service_health(self) -> bool:
+        """One reachability check per test run, over the shared session."""
+        health_url = f"{self.service_url}/health"
+        try:
+            resp = self.session.get(health_url, timeout=5)
+            if resp.status_code != 200:
+                print(f"⚠️  Health check returned {resp.status_code}; continuing anyway")
+            return True
+        except requests.RequestException as e:
+            print(f"❌ Service unreachable at {health_url}: {e}")
+            return False
+
+    def run_genai_perf(self, concurrency: int, isl: int, osl: int, output_dir: Path) -> bool:
+        """Launch one genai-perf run; returns True when it exits cleanly."""
+        cmd = [
+            "genai-perf", "profile",
+            "-m", self.model_name,
+            "--endpoint-type", "chat",
+            "--streaming",
+            "-u", self.service_url,
+            "--synthetic-input-tokens-mean", str(isl),
+            "--synthetic-input-tokens-stddev", "0",
+            "--output-tokens-mean", str(osl),
+            "--output-tokens-stddev", "0",
+            "--extra-inputs", f"max_tokens:{osl}",
+            "--extra-inputs", "ignore_eos:true",
+            "--concurrency", str(concurrency),
+            "--request-count", str(max(concurrency * 3, 30)),
+            "--warmup-request-count", str(concurrency),
+            "--artifact-dir", str(output_dir),
+        ]
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+            return result.returncode == 0
+        except subprocess.TimeoutExpired:
+            print(f"⏰ genai-perf timed out at concurrency {concurrency}")
+            return False
+
+    def analyze_latency_distribution(self, result_data: dict) -> dict:
+        """Summarize the raw TTFT/TPOT sample distributions."""
+        ttft_data = result_data.get("time_to_first_token", {}).get("data", [])
+        tpot_data = result_data.get("inter_token_latency", {}).get("data", [])
+
+        # One np.percentile call replaces three separate Python sorts per
+        # metric, and the mean/std/median reductions run in C over one array.
+        def _summarize(samples):
+            arr = np.asarray(samples, dtype=np.float64)
+            p90, p95, p99 = np.percentile(arr, [90, 95, 99])
+            return {
+                "mean": float(arr.mean()),
+                "median": float(np.median(arr)),
+                "std": float(arr.std(ddof=1)) if arr.size > 1 else 0.0,
+                "p90": float(p90),
+                "p95": float(p95),
+                "p99": float(p99),
+            }
+
+        stats = {}
+        if ttft_data:
+            stats["ttft"] = _summarize(ttft_data)
+        if tpot_data:
+            stats["tpot"] = _summarize(tpot_data)
+        return stats
+
+    # Percentiles each latency metric must satisfy. Widening the SLO to
+    # p95/p99 later only means extending these tuples.
+    _TTFT_PERCENTILES = ("p90",)
+    _ITL_PERCENTILES = ("p90",)
+
+    def analyze_slo_satisfaction(self, result_data: dict, slo: dict) -> dict:
+        """Check the configured latency percentiles against one SLO tier."""
+        ttft_stats = result_data.get("time_to_first_token", {})
+        itl_stats = result_data.get("inter_token_latency", {})
+
+        ttft_vals = np.array([ttft_stats.get(p, np.inf) for p in self._TTFT_PERCENTILES])
+        itl_vals = np.array([itl_stats.get(p, np.inf) for p in self._ITL_PERCENTILES])
+
+        ttft_ok = bool(np.all(ttft_vals < slo["ttft"]))
+        itl_ok = bool(np.all(itl_vals < slo["itl"]))
+        return {
+            "ttft_p90": float(ttft_vals[0]),
+            "itl_p90": float(itl_vals[0]),
+            "ttft_ok": ttft_ok,
+            "itl_ok": itl_ok,
+            "slo_met": ttft_ok and itl_ok,
+        }
+
+    def _run_or_get(self, concurrency: int, isl: int, osl: int):
+        """Return the raw genai-perf result for a concurrency, running it at most once.
+
+        With --reuse-exports, the artifact dir — keyed by model, URL, ISL,
+        OSL and concurrency — also acts as a disk-level cache: a fresh
+        profile export already there (e.g. from an aborted earlier run) is
+        reused instead of relaunching genai-perf.
+        """
+        key = (isl, osl, concurrency)
+        cached = self._bench_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Serialize per key: when two tiers probe the same concurrency at the
+        # same time, one runs genai-perf and the other waits for the cache.
+        with self._cache_lock:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+        with key_lock:
+            cached = self._bench_cache.get(key)
+            if cached is not None:
+                return cached
+            return self._run_uncached(key, concurrency, isl, osl)
+
+    @staticmethod
+    def _find_export(output_dir: Path):
+        """Resolve the profile export, trying the known layout before walking.
+
+        After the first successful run the export location is predictable;
+        the recursive glob only happens when the direct probe misses.
+        """
+        expected = output_dir / "artifacts" / "profile_export_genai_perf.json"
+        if expected.is_file():
+            return expected
+        matches = list(output_dir.rglob("profile_export_genai_perf.json"))
+        return matches[0] if matches else None
+
+    def _export_dir(self, concurrency: int, isl: int, osl: int) -> Path:
+        """Artifact dir keyed by the full workload, not just concurrency.
+
+        Folding model, URL, ISL and OSL into the path keeps runs against a
+        different deployment or sequence-length mix from ever seeing each
+        other's exports.
+        """
+        tag = hashlib.blake2b(
+            f"{self.model_name}:{self.service_url}:{isl}:{osl}".encode(),
+            digest_size=4).hexdigest()
+        return Path(f"/tmp/distserve_test_{tag}_c{concurrency}")
+
+    def _run_uncached(self, key, concurrency: int, isl: int, osl: int):
+        output_dir = self._export_dir(concurrency, isl, osl)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        json_file = None
+        if self.reuse_exports:
+            json_file = self._find_export(output_dir)
+            if json_file is not None and (
+                    time.time() - json_file.stat().st_mtime
+                    >= self.export_ttl_s):
+                json_file = None
+        if json_file is not None:
+            print(f"♻️  Reusing on-disk profile export for concurrency={concurrency}")
+        else:
+            print(f"🚀 Probing concurrency={concurrency} (isl={isl}, osl={osl})")
+            if not self.run_genai_perf(concurrency, isl, osl, output_dir):
+                return None
+            json_file = self._find_export(output_dir)
+            if json_file is None:
+                print(f"❌ No profile export found under {output_dir}")
+                return None
+
+        if ijson is not None and not self.analyze_distributions:
+            result_data = _extract_scalars(json_file)
+        else:
+            raw = json_file.read_bytes()
+            result_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+        self._bench_cache[key] = result_data
+        return result_data
+
+    def run_benchmark_with_slo(self, concurrency: int, slo: dict, isl: int, osl: int):
+        """Evaluate one concurrency against an SLO tier, reusing cached raw runs."""
+        result_data = self._run_or_get(concurrency, isl, osl)
+        if result_data is None:
+            return None
+
+        slo_analysis = self.analyze_slo_satisfaction(result_data, slo)
+        throughput = result_data.get("request_throughput", {}).get("avg", 0.0)
+        result = {
+            "concurrency": concurrency,
+            "request_throughput": throughput,
+            "output_token_throughput": result_data.get("output_token_throughput", {}).get("avg", 0.0),
+            "token_throughput_per_user": result_data.get("output_token_throughput_per_user", {}).get("avg", 0.0),
+            "slo_analysis": slo_analysis,
+            "slo_met": slo_analysis["slo_met"],
+            "goodput": throughput if slo_analysis["slo_met"] else 0.0,
+        }
+        if self.analyze_distributions:
+            # The full export was parsed in this mode, so the raw TTFT/TPOT
+            # samples are available for the report's distribution lines.
+            result["latency_distribution"] = \
+                self.analyze_latency_distribution(result_data)
+        return result
+
+    def find_max_goodput(self, slo_name: str, slo: dict, isl: int, osl: int,
+                         start_concurrency: int = 1, tolerance: int = 2,
+                         max_failures: int = 3, max_concurrency: int = 1000):
+        """Find the concurrency maximizing goodput under one SLO tier.
+
+        "SLO met" is a monotone-ish predicate in concurrency, so the search
+        doubles until the first failure and then bisects the crossover —
+        O(log N) probes instead of a linear walk. Doubling candidates are still
+        dispatched in parallel windows of four worker threads, every probed
+        concurrency is memoized so bisection midpoints never re-run genai-perf,
+        and the consecutive-failure guard remains as a secondary stop for
+        flaky runs.
+        """
+        print(f"\n{'=' * 60}")
+        print(f"🎯 SLO tier '{slo_name}': TTFT < {slo['ttft']} ms, ITL < {slo['itl']} ms")
+        print(f"{'=' * 60}")
+
+        best = None
+        probed = {}
+
+        def probe(concurrency):
+            if concurrency not in probed:
+                probed[concurrency] = self.run_benchmark_with_slo(concurrency, slo, isl, osl)
+            return probed[concurrency]
+
+        def consider(result):
+            nonlocal best
+            if best is None or result["goodput"] > best["goodput"]:
+                best = result
+
+        # Phase 1: exponential expansion until the SLO first fails.
+        lo = start_concurrency
+        first_fail = None
+        failures = 0
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            window_start = start_concurrency
+            while first_fail is None and failures < max_failures and window_start <= max_concurrency:
+                candidates = [window_start * (2 ** j) for j in range(4)]
+                results = list(executor.map(probe, candidates))
+                for concurrency, result in zip(candidates, results):
+                    if result is None:
+                        failures += 1
+                        if failures >= max_failures:
+                            break
+                        continue
+                    if not result["slo_met"]:
+                        first_fail = concurrency
+                        break
+                    failures = 0
+                    consider(result)
+                    lo = concurrency
+                window_start = candidates[-1] * 2
+
+        # Phase 2: bisect [last passing, first failing] down to `tolerance`.
+        if first_fail is not None:
+            hi = first_fail
+            while hi - lo > tolerance:
+                mid = (lo + hi) // 2
+                result = probe(mid)
+                if result is not None and result["slo_met"]:
+                    consider(result)
+                    lo = mid
+                else:
+                    hi = mid
+
+        if best is not None:
+            print(f"✅ SLO '{slo_name}': max goodput {best['goodput']:.2f} req/s "
+                  f"at concurrency {best['concurrency']}")
+        else:
+            print(f"⚠️  SLO '{slo_name}': no concurrency satisfied the tier")
+        return best
+
+    async def _run_all_tiers(self, isl: int, osl: int) -> dict:
+        slo_items = list(self.slo_configs.items())
+        tasks = [asyncio.to_thread(self.find_max_goodput, slo_name, slo, isl, osl)
+                 for slo_name, slo in slo_items]
+        tier_results = await asyncio.gather(*tasks)
+        return {slo_name: result
+                for (slo_name, _), result in zip(slo_items, tier_results)}
+
+    def run_single_deployment_test(self, isl: int, osl: int) -> dict:
+        """Run the full SLO sweep against the configured deployment.
+
+        Tiers run concurrently: the shared result cache means whichever tier
+        reaches a concurrency first pays for the genai-perf run, and the
+        others evaluate the cached JSON compute-only.
+        """
+        return asyncio.run(self._run_all_tiers(isl, osl))
+
+    def generate_single_deployment_report(self, results: dict, isl: int, osl: int) -> str:
+        """Render the per-SLO summary for one deployment."""
+        report = []
+        report.append("=" * 80)
+        report.append("DISTSERVE-STYLE GOODPUT REPORT")
+        report.append(f"Model: {self.model_name}")
+        report.append(f"Service: {self.service_url}")
+        report.append(f"Workload: ISL={isl}, OSL={osl}")
+        report.append("=" * 80)
+        report.append("")
+        report.append(f"{'SLO tier':<15} {'TTFT(ms)':<10} {'ITL(ms)':<10} "
+                      f"{'Concurrency':<12} {'Goodput(req/s)':<15} {'Per-user(tok/s)':<15}")
+        report.append("-" * 80)
+
+        for slo_name, slo in self.slo_configs.items():
+            best = results.get(slo_name)
+            if best is None:
+                report.append(f"{slo_name:<15} {slo['ttft']:<10} {slo['itl']:<10} "
+                              f"{'N/A':<12} {'N/A':<15} {'N/A':<15}")
+                continue
+            # Format each float once; the same strings feed any future
+            # console/file duplication of this row.
+            goodput_s = f"{best['goodput']:.2f}"
+            per_user_s = f"{best['token_throughput_per_user']:.2f}"
+            report.append(f"{slo_name:<15} {slo['ttft']:<10} {slo['itl']:<10} "
+                          f"{best['concurrency']:<12} {goodput_s:<15} {per_user_s:<15}")
+            for metric, stats in best.get("latency_distribution", {}).items():
+                report.append(
+                    f"    {metric} (ms): mean={stats['mean']:.1f} "
+                    f"median={stats['median']:.1f} std={stats['std']:.1f} "
+                    f"p90={stats['p90']:.1f} p95={stats['p95']:.1f} "
+                    f"p99={stats['p99']:.1f}")
+
+        report.append("")
+        report.append("=" * 80)
+        return "\n".join(report)
+
+    def save_report(self, report: str, isl: int, osl: int):
+        report_file = self.results_dir / f"distserve_report_isl{isl}_osl{osl}_{time.strftime('%Y%m%d_%H%M%S')}.txt"
+        # write_bytes skips the TextIOWrapper encoding layer: one encode, one
+        # write(2).
+        report_file.write_bytes(report.encode("utf-8"))
+        print(f"📄 Report saved to {report_file}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DistServe-style goodput test (genai-perf)")
+    parser.add_argument("--model", required=True, help="Model name served by the endpoint")
+    parser.add_argument("--url", default="http://localhost:8000", help="Service base URL")
+    parser.add_argument("--isl", type=int, default=2000, help="Input sequence length")
+    parser.add_argument("--osl", type=int, default=200, help="Output sequence length")
+    parser.add_argument("--results-dir", default="distserve_results", help="Directory for reports")
+    parser.add_argument("--analyze-distributions", action="store_true",
+                        help="Parse full exports (incl. per-request samples) for distribution stats")
+    parser.add_argument("--reuse-exports", action="store_true",
+                        help="Reuse on-disk profile exports from earlier runs of the same workload")
+    parser.add_argument("--export-ttl", type=float, default=24.0,
+                        help="Max age in hours of a reusable export")
+    args = parser.parse_args()
+
+    test = DistServeStyleTest(args.model, args.url, args.results_dir,
+                              analyze_distributions=args.analyze_distributions,
+                              reuse_exports=args.reuse_exports,
+                              export_ttl_hours=args.export_ttl)
+    if not test.check_service_health():
+        return
+    results = test.run_single_deployment_test(args.isl, args.osl)
+    report = test.generate_single_deployment_report(results, args.isl, args.osl)
+    print(report)
+    test.save_report(report, args.isl, args.osl)
+
+
+if __name__ == "__main__":
+    main()